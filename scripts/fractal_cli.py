@@ -2,6 +2,7 @@ import os
 import requests
 import json
 import jwt
+from decimal import Decimal, InvalidOperation
 from dotenv import load_dotenv
 import os
 
@@ -89,17 +90,24 @@ def confirm_signup(username, confirmation_code):
             print(f"Response Body: {e.response.text}")
         return False
 
+def is_decimal(value):
+    try:
+        return Decimal(value).is_finite()
+    except InvalidOperation:
+        return False
+
 def generate_fractal():
     if not current_token:
         print("Please log in first.")
         return
 
     print("\n--- Generate Fractal ---")
+    deep_zoom = input("Deep zoom mode for scales below 1e-13? (y/n): ").lower() == 'y'
     print("Enter parameters (leave blank for default/random):")
     width = input("Width (default 1920): ")
     height = input("Height (default 1080): ")
     iterations = input("Max Iterations (default 500): ")
-    power = input("Power (default 2): ")
+    power = input("Power (default 2, whole number 2-16 for deep zoom): ")
     c_real = input("C Real (default 0.285): ")
     c_imag = input("C Imag (default 0.01): ")
     scale = input("Scale (default 1): ")
@@ -114,11 +122,23 @@ def generate_fractal():
     if power: params["power"] = float(power)
     if c_real: params["real"] = float(c_real)
     if c_imag: params["imag"] = float(c_imag)
-    if scale: params["scale"] = float(scale)
-    if offset_x: params["offsetX"] = float(offset_x)
-    if offset_y: params["offsetY"] = float(offset_y)
     if colour_scheme: params["color"] = colour_scheme
 
+    if deep_zoom:
+        # Sent as the typed decimal strings; converting to float would throw away the zoom
+        for name, value in (("scale", scale), ("offsetX", offset_x), ("offsetY", offset_y)):
+            if not value:
+                continue
+            if not is_decimal(value):
+                print(f"\n{name} must be a decimal number, got '{value}'.")
+                return
+            params[name] = value.strip()
+        params["deep"] = "true"
+    else:
+        if scale: params["scale"] = float(scale)
+        if offset_x: params["offsetX"] = float(offset_x)
+        if offset_y: params["offsetY"] = float(offset_y)
+
     headers = {"Authorization": f"Bearer {current_token}"}
     try:
         r = requests.get(f"{BASE_URL}/fractal", headers=headers, params=params, timeout=180)
@@ -138,6 +158,77 @@ def generate_fractal():
             print(f"HTTP Status Code: {e.response.status_code}")
             print(f"Response Body: {e.response.text}")
 
+def generate_sequence():
+    if not current_token:
+        print("Please log in first.")
+        return
+
+    print("\n--- Generate Animation ---")
+    print("Enter parameters (leave blank for default):")
+    keyframe_count = input("Number of keyframes (default 2): ")
+    keyframe_count = int(keyframe_count) if keyframe_count else 2
+
+    keyframes = []
+    for i in range(keyframe_count):
+        print(f"\nKeyframe {i + 1}:")
+        scale = input("  Scale (default 1): ")
+        offset_x = input("  Offset X (default 0): ")
+        offset_y = input("  Offset Y (default 0): ")
+        c_real = input("  C Real (default 0.285): ")
+        c_imag = input("  C Imag (default 0.01): ")
+        power = input("  Power (default 2): ")
+
+        keyframe = {}
+        if scale: keyframe["scale"] = float(scale)
+        if offset_x: keyframe["offsetX"] = float(offset_x)
+        if offset_y: keyframe["offsetY"] = float(offset_y)
+        if c_real: keyframe["real"] = float(c_real)
+        if c_imag: keyframe["imag"] = float(c_imag)
+        if power: keyframe["power"] = float(power)
+        keyframes.append(keyframe)
+
+    print()
+    frames = input("Number of frames (default 30): ")
+    width = input("Width (default 640): ")
+    height = input("Height (default 360): ")
+    iterations = input("Max Iterations (default 500): ")
+    colour_scheme = input("Colour Scheme (rainbow, grayscale, fire, hsl - default rainbow): ")
+    output_format = input("Output (frames for an image sequence, apng for an animation - default frames): ")
+    fps = input("Animation FPS (default 12): ") if output_format == "apng" else ""
+
+    body = {"keyframes": keyframes, "frames": int(frames) if frames else 30}
+    if width: body["width"] = int(width)
+    if height: body["height"] = int(height)
+    if iterations: body["iterations"] = int(iterations)
+    if colour_scheme: body["color"] = colour_scheme
+    if output_format: body["format"] = output_format
+    if fps: body["fps"] = int(fps)
+
+    headers = {"Authorization": f"Bearer {current_token}"}
+    try:
+        with requests.post(f"{BASE_URL}/fractal/sequence", headers=headers, json=body, stream=True, timeout=600) as r:
+            r.raise_for_status()
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+                if event.get('event') == 'frame':
+                    print(f"\rRendered {event['completed']}/{event['total']} frames ({event['fps']:.1f} fps)", end="", flush=True)
+                elif event.get('event') == 'done':
+                    print(f"\n\n{event['frames']} frames in {event['seconds']:.1f}s on {event['workers']} workers "
+                          f"({event['fps']:.2f} fps, {event['reusedFraction'] * 100:.0f}% of pixels reused)")
+                    if event.get('url'):
+                        print(f"Animation URL: {event['url']}")
+                    for i, url in enumerate(event.get('urls', [])):
+                        print(f"Frame {i}: {url}")
+                elif event.get('event') == 'error':
+                    print(f"\nAnimation generation failed: {event.get('message')}")
+    except requests.exceptions.RequestException as e:
+        print(f"\nAnimation generation failed: {e}")
+        if e.response is not None:
+            print(f"HTTP Status Code: {e.response.status_code}")
+            print(f"Response Body: {e.response.text}")
+
 def view_data(view_type="my_gallery", limit=None, offset=None, filters=None, sortBy=None, sortOrder=None, prompt_for_options=True):
     if not current_token:
         print("Please log in first.")
@@ -247,8 +338,15 @@ def view_data(view_type="my_gallery", limit=None, offset=None, filters=None, sor
                     offset_y = entry.get('offsetY', 'N/A')
                     colour_scheme = entry.get('colourScheme', 'N/A')
 
+                    deep_zoom = entry.get('deep_zoom')
+                    if deep_zoom:
+                        precise_view = json.loads(deep_zoom)
+                        scale = precise_view.get('scale', scale)
+                        offset_x = precise_view.get('offsetX', offset_x)
+                        offset_y = precise_view.get('offsetY', offset_y)
+
                     print(f"ID: {entry.get('id')}, Hash: {display_hash}{user_info}, Time: {entry.get(timestamp_field)}")
-                    print(f"  Params: W:{width}, H:{height}, Iter:{iterations}, Power:{power}, C:{c_real}+{c_imag}i, Scale:{scale}, Offset:{offset_x},{offset_y}, Colour:{colour_scheme}\n")
+                    print(f"  Params: W:{width}, H:{height}, Iter:{iterations}, Power:{power}, C:{c_real}+{c_imag}i, Scale:{scale}, Offset:{offset_x},{offset_y}, Colour:{colour_scheme}{', Deep Zoom' if deep_zoom else ''}\n")
             
             # New interactive section
             while True:
@@ -444,8 +542,9 @@ def user_menu():
         print("3. View All History (Admin)")
         print("4. View All Gallery (Admin)")
         print("5. Delete Gallery Entry")
-        print("6. Logout")
-        print("7. Exit")
+        print("6. Generate Animation")
+        print("7. Logout")
+        print("8. Exit")
 
         print()
         choice = input("Enter your choice: ")
@@ -561,12 +660,17 @@ def user_menu():
             input("\nPress Enter to continue...")
             
         elif choice == "6":
+            clear_terminal()
+            generate_sequence()
+            input("\nPress Enter to continue...")
+
+        elif choice == "7":
             current_user_info = None
             current_token = None
             print("\nLogged out successfully.")
             input("Press Enter to continue...")
             break
-        elif choice == "7":
+        elif choice == "8":
             clear_terminal()
             print("\nExiting CLI. Goodbye!")
             exit()
@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Runs server.js against local stand-ins for Parameter Store, Secrets Manager and S3,
+# and reports how long it takes from process start to the first 200 from /api/health.
+# PostgreSQL and Memcached are not stubbed: point PGHOST/PGPORT/PGUSER/PGPASSWORD/PGDATABASE
+# and MEMCACHED_ADDRESS at local instances (e.g. docker run postgres / memcached).
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUCKET_NAME = "n11051337-a2-fractals-local"
+
+aws_call_latency = 0.0
+ssm_down = False
+aws_calls = []
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def build_parameters(app_port):
+    return {
+        "/n11051337/aws_region": "ap-southeast-2",
+        "/n11051337/port": str(app_port),
+        "/n11051337/s3_bucket_name": BUCKET_NAME,
+        "/n11051337/s3_tag_qut_username": "n11051337@qut.edu.au",
+        "/n11051337/s3_tag_purpose": "assessment-2",
+        "/n11051337/memcached_address": os.getenv("MEMCACHED_ADDRESS", "localhost:11211"),
+        "/n11051337/user_pool_id": "ap-southeast-2_localpool",
+        "/n11051337/client_id": "localclientid",
+    }
+
+
+SECRETS = {
+    "n11051337-A2-DB": {
+        "host": os.getenv("PGHOST", "localhost"),
+        "port": int(os.getenv("PGPORT", "5432")),
+        "username": os.getenv("PGUSER", "postgres"),
+        "password": os.getenv("PGPASSWORD", "postgres"),
+        "dbname": os.getenv("PGDATABASE", "postgres"),
+        "ssl": False,
+    },
+    "n11051337-A2-JWT": {"JWT_SECRET": "local-jwt-secret"},
+    "n11051337-A2-Cognito": {"AWS_COGNITO_CLIENT_SECRET": "local-cognito-secret"},
+}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    parameters = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/x-amz-json-1.1")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_empty(self, status):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        target = self.headers.get("X-Amz-Target", "")
+        aws_calls.append(target)
+        time.sleep(aws_call_latency)
+
+        if target.startswith("AmazonSSM.") and ssm_down:
+            return self.send_json(400, {"__type": "AccessDeniedException", "message": "stand-in SSM is down"})
+
+        if target == "AmazonSSM.GetParameters":
+            found = [{"Name": n, "Value": self.parameters[n], "Type": "String"} for n in body["Names"] if n in self.parameters]
+            missing = [n for n in body["Names"] if n not in self.parameters]
+            return self.send_json(200, {"Parameters": found, "InvalidParameters": missing})
+        if target == "AmazonSSM.GetParameter":
+            name = body["Name"]
+            if name not in self.parameters:
+                return self.send_json(400, {"__type": "ParameterNotFound", "message": name})
+            return self.send_json(200, {"Parameter": {"Name": name, "Value": self.parameters[name], "Type": "String"}})
+        if target == "secretsmanager.GetSecretValue":
+            secret = SECRETS.get(body["SecretId"])
+            if secret is None:
+                return self.send_json(400, {"__type": "ResourceNotFoundException", "message": body["SecretId"]})
+            return self.send_json(200, {"Name": body["SecretId"], "SecretString": json.dumps(secret)})
+
+        self.send_json(400, {"__type": "UnknownOperationException", "message": target})
+
+    def do_HEAD(self):
+        aws_calls.append(f"S3.HEAD {self.path}")
+        time.sleep(aws_call_latency)
+        self.send_empty(200)
+
+    def do_PUT(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        aws_calls.append(f"S3.PUT {self.path}")
+        time.sleep(aws_call_latency)
+        self.send_empty(204 if "tagging" in self.path else 200)
+
+
+def start_stand_ins(app_port):
+    StandInHandler.parameters = build_parameters(app_port)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_once(stand_in_port, app_port, snapshot_path, timeout):
+    env = dict(os.environ)
+    env.update({
+        "AWS_ENDPOINT_URL": f"http://127.0.0.1:{stand_in_port}",
+        "AWS_ACCESS_KEY_ID": "local",
+        "AWS_SECRET_ACCESS_KEY": "local",
+        "AWS_REGION": "ap-southeast-2",
+        "CONFIG_SNAPSHOT_PATH": snapshot_path,
+    })
+    aws_calls.clear()
+    phases_line = None
+    output = []
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(["node", "server.js"], cwd=REPO_ROOT, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+    def read_output():
+        for line in proc.stdout:
+            output.append(line.rstrip())
+
+    reader = threading.Thread(target=read_output, daemon=True)
+    reader.start()
+
+    time_to_200 = None
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                break
+            try:
+                r = requests.get(f"http://127.0.0.1:{app_port}/api/health", timeout=1)
+                if r.status_code == 200:
+                    time_to_200 = time.perf_counter() - start
+                    break
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(0.01)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        reader.join(timeout=1)
+
+    for line in output:
+        if line.startswith("Startup phases"):
+            phases_line = line
+    return time_to_200, phases_line, list(aws_calls), output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure server time-to-first-200 against local AWS stand-ins.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=20, help="simulated round trip per AWS call")
+    parser.add_argument("--ssm-down", action="store_true", help="fail Parameter Store calls to exercise the config snapshot")
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    aws_call_latency = args.latency_ms / 1000
+    app_port = free_port()
+    stand_ins = start_stand_ins(app_port)
+    stand_in_port = stand_ins.server_address[1]
+    snapshot_path = os.path.join(tempfile.mkdtemp(), "config-snapshot.json")
+
+    if args.ssm_down:
+        # Prime the snapshot with one healthy boot, then take Parameter Store away
+        run_once(stand_in_port, app_port, snapshot_path, args.timeout)
+        ssm_down = True
+
+    times = []
+    for run in range(1, args.runs + 1):
+        time_to_200, phases_line, calls, output = run_once(stand_in_port, app_port, snapshot_path, args.timeout)
+        if time_to_200 is None:
+            print(f"Run {run}: server never returned 200. Output:")
+            print("\n".join(output[-20:]))
+            continue
+        times.append(time_to_200)
+        print(f"Run {run}: first 200 after {time_to_200 * 1000:.0f}ms, {len(calls)} AWS calls")
+        if phases_line:
+            print(f"  {phases_line}")
+
+    stand_ins.shutdown()
+
+    if times:
+        print(f"\nTime-to-first-200 over {len(times)} runs: "
+              f"min {min(times) * 1000:.0f}ms, median {statistics.median(times) * 1000:.0f}ms, max {max(times) * 1000:.0f}ms")
@@ -1,8 +1,12 @@
 
+// Taken before any requires: config, secrets and the database start loading as modules are
+// required, so phase timings are reported as time since boot rather than from when they're awaited
+const bootStart = process.hrtime.bigint();
+
 require('dotenv').config();
 
 const express = require('express');
-const { router: authRouter, verifyToken } = require('./src/routes/auth');
+const { router: authRouter, verifyToken, initialised: authInitialised } = require('./src/routes/auth');
 const fractalRouter = require('./src/routes/fractal');
 const historyRouter = require('./src/routes/history');
 const galleryRouter = require('./src/routes/gallery');
@@ -10,6 +14,7 @@ const galleryRouter = require('./src/routes/gallery');
 const s3Service = require('./src/services/s3Service');
 const awsConfigService = require('./src/services/awsConfigService');
 const cacheService = require('./src/services/cacheService');
+const db = require('./src/database');
 
 const app = express();
 let port;
@@ -17,21 +22,49 @@ let port;
 app.use(express.json());
 app.use('/fractals', express.static('fractals'));
 
+app.get('/api/health', (req, res) => {
+  res.json({ status: 'ok' });
+});
+
 app.use('/api/auth', authRouter);
 app.use('/api', fractalRouter);
 app.use('/api', historyRouter);
 app.use('/api', galleryRouter);
 
+const startupTimings = {};
+
+function sinceBoot() {
+  return Number(process.hrtime.bigint() - bootStart) / 1e6;
+}
+
+// Records when a phase finished, in ms since boot
+async function timePhase(name, fn) {
+  const result = await fn();
+  startupTimings[name] = sinceBoot();
+  return result;
+}
+
 (async () => {
   try {
+    const configSource = await timePhase('config', () => awsConfigService.loadConfig());
     port = await awsConfigService.getParameter('/n11051337/port');
     if (!port) {
       console.error('Failed to retrieve port from Parameter Store. Exiting application.');
       process.exit(1);
     }
-    await s3Service.ensureBucketAndTags();
-    await cacheService.init();
+    await Promise.all([
+      timePhase('s3', () => s3Service.ensureBucketAndTags()),
+      timePhase('cache', () => cacheService.init()),
+      timePhase('database', () => db.initialised),
+      timePhase('cognito', () => authInitialised),
+      timePhase('secrets', () => awsConfigService.getCognitoClientSecret()),
+    ]);
     app.listen(port, () => {
+      startupTimings.listening = sinceBoot();
+      const summary = Object.entries(startupTimings)
+        .map(([name, ms]) => `${name}=${ms.toFixed(1)}ms`)
+        .join(' ');
+      console.log(`Startup phases, ready at ms since boot (config from ${configSource}): ${summary}`);
       console.log(`Server running on port ${port}`);
     });
   } catch (error) {
@@ -24,57 +24,58 @@ async function getDbSecrets() {
     }
 }
 
+const fractalsTable = `
+CREATE TABLE IF NOT EXISTS fractals (
+    id SERIAL PRIMARY KEY,
+    hash TEXT UNIQUE NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    iterations INTEGER NOT NULL,
+    power REAL NOT NULL,
+    c_real REAL NOT NULL,
+    c_imag REAL NOT NULL,
+    scale REAL NOT NULL,
+    "offsetX" REAL NOT NULL,
+    "offsetY" REAL NOT NULL,
+    "colourScheme" TEXT NOT NULL,
+    deep_zoom TEXT,
+    s3_key TEXT UNIQUE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+)`;
+
+// Tables created before deep zoom existed
+const fractalsDeepZoomColumn = `ALTER TABLE fractals ADD COLUMN IF NOT EXISTS deep_zoom TEXT`;
+
+const historyTable = `
+CREATE TABLE IF NOT EXISTS history (
+    id SERIAL PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    username TEXT NOT NULL,
+    fractal_id INTEGER,
+    generated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (fractal_id) REFERENCES fractals (id) ON DELETE SET NULL
+)`;
+
+const galleryTable = `
+CREATE TABLE IF NOT EXISTS gallery (
+    id SERIAL PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    fractal_id INTEGER NOT NULL,
+    fractal_hash TEXT NOT NULL,
+    added_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(user_id, fractal_hash),
+    FOREIGN KEY (fractal_id) REFERENCES fractals (id) ON DELETE CASCADE
+)`;
+
 async function initialiseDatabase() {
     try {
-        const client = await pool.connect();
-
-        const fractalsTable = `
-        CREATE TABLE IF NOT EXISTS fractals (
-            id SERIAL PRIMARY KEY,
-            hash TEXT UNIQUE NOT NULL,
-            width INTEGER NOT NULL,
-            height INTEGER NOT NULL,
-            iterations INTEGER NOT NULL,
-            power REAL NOT NULL,
-            c_real REAL NOT NULL,
-            c_imag REAL NOT NULL,
-            scale REAL NOT NULL,
-            "offsetX" REAL NOT NULL,
-            "offsetY" REAL NOT NULL,
-            "colourScheme" TEXT NOT NULL,
-            s3_key TEXT UNIQUE NOT NULL,
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-        )`;
-
-        await client.query(fractalsTable);
-        const historyTable = `
-        CREATE TABLE IF NOT EXISTS history (
-            id SERIAL PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            username TEXT NOT NULL,
-            fractal_id INTEGER,
-            generated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (fractal_id) REFERENCES fractals (id) ON DELETE SET NULL
-        )`;
-
-        await client.query(historyTable);
-
-        const galleryTable = `
-        CREATE TABLE IF NOT EXISTS gallery (
-            id SERIAL PRIMARY KEY,
-            user_id TEXT NOT NULL,
-            fractal_id INTEGER NOT NULL,
-            fractal_hash TEXT NOT NULL,
-            added_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(user_id, fractal_hash),
-            FOREIGN KEY (fractal_id) REFERENCES fractals (id) ON DELETE CASCADE
-        )`;
-
-        await client.query(galleryTable);
-
-
-
-        client.release();
+        // history and gallery both reference fractals, so only fractals has to go first
+        await pool.query(fractalsTable);
+        await Promise.all([
+            pool.query(fractalsDeepZoomColumn),
+            pool.query(historyTable),
+            pool.query(galleryTable),
+        ]);
     } catch (err) {
         console.error('Error initialising database:', err.message);
         process.exit(-1);
@@ -96,7 +97,7 @@ async function initDbAndPool() {
         password: dbSecrets.password,
         database: dbSecrets.dbname,
         port: dbSecrets.port,
-        ssl: {
+        ssl: dbSecrets.ssl === false ? false : {
             rejectUnauthorized: false
         }
     });
@@ -0,0 +1,347 @@
+const { createCanvas } = require('canvas');
+const { getColour, smoothIteration } = require('./fractal');
+
+// Deep-zoom renderer. One reference orbit is iterated in BigInt fixed point, every
+// other pixel is iterated as a double-precision delta from it (perturbation), and
+// pixels whose delta stops tracking the reference are re-rendered from a new one.
+
+const GLITCH_TOLERANCE = 1e-6; // |z|^2 < tolerance * |Z|^2 means the delta lost precision
+const MAX_REFERENCES = 16;
+const MIN_SCALE = 1e-300; // deltas are plain doubles, so stay clear of their exponent limit
+const MAX_SCALE = 4;
+const MAX_OFFSET = 4; // everything further out escapes on the first iteration
+const MAX_C = 4;
+// Every iteration is a run of BigInt multiplies, so power and iterations are capped
+const MAX_POWER = 16;
+const MAX_ITERATIONS = 20000;
+const ITERATION_BATCH = 1024; // fixed-point iterations between deadline checks
+const PERTURBATION_BATCH = 1 << 22; // worst-case delta iterations x power between deadline checks
+// Bounds on the decimal strings themselves, checked before any BigInt work
+const MAX_DECIMAL_LENGTH = 400;
+const MAX_EXPONENT = 400;
+
+const DECIMAL_PATTERN = /^[+-]?(\d+\.?\d*|\.\d+)([eE]([+-]?\d+))?$/;
+
+function isDecimalString(value) {
+    if (typeof value !== 'string') return false;
+    const trimmed = value.trim();
+    if (trimmed.length > MAX_DECIMAL_LENGTH) return false;
+    const match = trimmed.match(DECIMAL_PATTERN);
+    return Boolean(match) && (!match[3] || Math.abs(parseInt(match[3], 10)) <= MAX_EXPONENT);
+}
+
+// Returns a message describing why deep-zoom options are out of range, or null if they are usable
+function deepOptionsError({ scale, offsetX, offsetY, c, power, maxIterations }) {
+    if (!Number.isInteger(power) || power < 2 || power > MAX_POWER) {
+        return `Deep zoom requires an integer power between 2 and ${MAX_POWER}.`;
+    }
+    if (!Number.isInteger(maxIterations) || maxIterations < 1 || maxIterations > MAX_ITERATIONS) {
+        return `Deep zoom iterations must be between 1 and ${MAX_ITERATIONS}.`;
+    }
+    if (![c.real, c.imag].every(value => Number.isFinite(value) && Math.abs(value) <= MAX_C)) {
+        return `Deep zoom c values must be between -${MAX_C} and ${MAX_C}.`;
+    }
+    if (![scale, offsetX, offsetY].every(isDecimalString)) {
+        return `Deep zoom scale and offsets must be decimal strings of at most ${MAX_DECIMAL_LENGTH} characters with exponents within ±${MAX_EXPONENT}.`;
+    }
+    const scaleNumber = parseFloat(scale);
+    if (!Number.isFinite(scaleNumber) || scaleNumber < MIN_SCALE || scaleNumber > MAX_SCALE) {
+        return `Deep zoom scale must be between ${MIN_SCALE} and ${MAX_SCALE}.`;
+    }
+    if (![offsetX, offsetY].every(offset => Math.abs(parseFloat(offset)) <= MAX_OFFSET)) {
+        return `Deep zoom offsets must be between -${MAX_OFFSET} and ${MAX_OFFSET}.`;
+    }
+    return null;
+}
+
+// Decimal string -> BigInt holding value * 2^bits
+function parseFixed(value, bits) {
+    const match = String(value).trim().match(/^([+-]?)(\d*)\.?(\d*)(?:[eE]([+-]?\d+))?$/);
+    if (!match) {
+        throw new Error(`Invalid decimal value: ${value}`);
+    }
+    const [, sign, intPart, fracPart, exp] = match;
+    let mantissa = BigInt((intPart + fracPart) || '0');
+    const exponent = (exp ? parseInt(exp, 10) : 0) - fracPart.length;
+
+    let fixed;
+    if (exponent >= 0) {
+        fixed = (mantissa * 10n ** BigInt(exponent)) << BigInt(bits);
+    } else {
+        fixed = (mantissa << BigInt(bits)) / 10n ** BigInt(-exponent);
+    }
+    return sign === '-' ? -fixed : fixed;
+}
+
+// Exact binary value of a double -> BigInt holding value * 2^bits
+function numberToFixed(value, bits) {
+    if (!Number.isFinite(value)) {
+        throw new Error(`Cannot convert ${value} to fixed point.`);
+    }
+    let exponent = 0;
+    while (!Number.isInteger(value)) {
+        value *= 2;
+        exponent++;
+    }
+    const mantissa = BigInt(value);
+    return exponent <= bits ? mantissa << BigInt(bits - exponent) : mantissa >> BigInt(exponent - bits);
+}
+
+function fixedToNumber(value, bits) {
+    // Shift down first so the BigInt -> Number conversion never overflows
+    const keep = 60;
+    if (bits <= keep) {
+        return Number(value) / 2 ** bits;
+    }
+    return Number(value >> BigInt(bits - keep)) / 2 ** keep;
+}
+
+function precisionBits(scale) {
+    return Math.max(64, Math.ceil(-Math.log2(scale)) + 64);
+}
+
+// Yields to the event loop, then reports whether the render has run out of time
+async function pastDeadline(deadline) {
+    await new Promise(resolve => setImmediate(resolve));
+    return Date.now() > deadline;
+}
+
+function binomial(n, k) {
+    let result = 1;
+    for (let i = 1; i <= k; i++) {
+        result = result * (n - k + i) / i;
+    }
+    return result;
+}
+
+// High-precision orbit of refReal + refImag i, stored as doubles. For power p we also
+// keep C(p,k) * Z^(p-k) for k = 1..p, the coefficients of (Z+d)^p - Z^p in d.
+// Resolves to null if the deadline passes first.
+async function computeReferenceOrbit(refReal, refImag, c, power, maxIterations, bits, deadline) {
+    const shift = BigInt(bits);
+    const cReal = numberToFixed(c.real, bits);
+    const cImag = numberToFixed(c.imag, bits);
+    const escape = 4n << (shift * 2n);
+
+    const orbitReal = new Float64Array(maxIterations + 1);
+    const orbitImag = new Float64Array(maxIterations + 1);
+    const coeffReal = new Float64Array((maxIterations + 1) * power);
+    const coeffImag = new Float64Array((maxIterations + 1) * power);
+
+    let zr = refReal;
+    let zi = refImag;
+    let length = 0;
+
+    for (let n = 0; n <= maxIterations; n++) {
+        const dr = fixedToNumber(zr, bits);
+        const di = fixedToNumber(zi, bits);
+        orbitReal[n] = dr;
+        orbitImag[n] = di;
+        length = n + 1;
+
+        // Z^(p-k) built up from Z^0 in doubles; Z is O(1) so this is exact enough
+        let pr = 1;
+        let pi = 0;
+        for (let k = power; k >= 1; k--) {
+            const b = binomial(power, k);
+            coeffReal[n * power + (k - 1)] = b * pr;
+            coeffImag[n * power + (k - 1)] = b * pi;
+            const nextR = pr * dr - pi * di;
+            pi = pr * di + pi * dr;
+            pr = nextR;
+        }
+
+        if (zr * zr + zi * zi > escape) break;
+
+        let wr = zr;
+        let wi = zi;
+        for (let k = 1; k < power; k++) {
+            const nextR = (wr * zr - wi * zi) >> shift;
+            wi = (wr * zi + wi * zr) >> shift;
+            wr = nextR;
+        }
+        zr = wr + cReal;
+        zi = wi + cImag;
+
+        if (n % ITERATION_BATCH === ITERATION_BATCH - 1 && await pastDeadline(deadline)) {
+            return null;
+        }
+    }
+
+    return { orbitReal, orbitImag, coeffReal, coeffImag, length };
+}
+
+// Iterates one point entirely in fixed point. Only used for pixels no reference could
+// resolve, since it is far slower than perturbation. Resolves to null if the deadline passes first.
+async function iterateFixed(zr, zi, cReal, cImag, power, maxIterations, bits, deadline) {
+    const shift = BigInt(bits);
+    const escape = 4n << (shift * 2n);
+    let n = 0;
+    while (n < maxIterations) {
+        let wr = zr;
+        let wi = zi;
+        for (let k = 1; k < power; k++) {
+            const nextR = (wr * zr - wi * zi) >> shift;
+            wi = (wr * zi + wi * zr) >> shift;
+            wr = nextR;
+        }
+        zr = wr + cReal;
+        zi = wi + cImag;
+        if (zr * zr + zi * zi > escape) break;
+        n++;
+
+        if (n % ITERATION_BATCH === 0 && await pastDeadline(deadline)) {
+            return null;
+        }
+    }
+
+    return smoothIteration(n, fixedToNumber(zr, bits), fixedToNumber(zi, bits), power, maxIterations);
+}
+
+// Iterates one pixel's delta against the reference. Returns the smooth iteration
+// count, or null if the pixel glitched and needs a different reference.
+function iteratePerturbed(deltaReal, deltaImag, reference, power, maxIterations) {
+    const { orbitReal, orbitImag, coeffReal, coeffImag, length } = reference;
+    let dr = deltaReal;
+    let di = deltaImag;
+    let n = 0;
+    let zr = 0;
+    let zi = 0;
+
+    while (n < maxIterations) {
+        if (n + 1 >= length) return null; // reference escaped before this pixel did
+
+        // (Z+d)^p - Z^p = d * (a1 + d * (a2 + ... + d * ap)), Horner in d
+        const base = n * power;
+        let hr = coeffReal[base + power - 1];
+        let hi = coeffImag[base + power - 1];
+        for (let k = power - 2; k >= 0; k--) {
+            const nextR = hr * dr - hi * di + coeffReal[base + k];
+            hi = hr * di + hi * dr + coeffImag[base + k];
+            hr = nextR;
+        }
+        const nextR = hr * dr - hi * di;
+        di = hr * di + hi * dr;
+        dr = nextR;
+
+        const Zr = orbitReal[n + 1];
+        const Zi = orbitImag[n + 1];
+        zr = Zr + dr;
+        zi = Zi + di;
+        const mag = zr * zr + zi * zi;
+
+        if (mag > 4) break;
+        if (mag < GLITCH_TOLERANCE * (Zr * Zr + Zi * Zi)) return null;
+        n++;
+    }
+
+    return smoothIteration(n, zr, zi, power, maxIterations);
+}
+
+async function generateDeepFractal({
+    width = 800,
+    height = 600,
+    maxIterations = 500,
+    power = 2,
+    c = { real: 0.285, imag: 0.01 },
+    scale = '1.5',
+    offsetX = '0',
+    offsetY = '0',
+    colourScheme = "rainbow",
+    maxTime = 120000
+}) {
+    const optionsError = deepOptionsError({ scale, offsetX, offsetY, c, power, maxIterations });
+    if (optionsError) {
+        throw new Error(optionsError);
+    }
+    const scaleNumber = parseFloat(scale);
+
+    const bits = precisionBits(scaleNumber);
+    const scaleFixed = parseFixed(scale, bits);
+    const originReal = parseFixed(offsetX, bits) - scaleFixed;
+    const originImag = parseFixed(offsetY, bits) - scaleFixed;
+    const stepReal = 2 * scaleNumber / width;
+    const stepImag = 2 * scaleNumber / height;
+
+    const deadline = Date.now() + maxTime;
+    const pixelBatch = Math.max(1, Math.floor(PERTURBATION_BATCH / (maxIterations * power)));
+    const smooth = new Float64Array(width * height);
+    let pending = [];
+    for (let i = 0; i < width * height; i++) pending.push(i);
+
+    let refX = Math.floor(width / 2);
+    let refY = Math.floor(height / 2);
+
+    for (let round = 0; round < MAX_REFERENCES && pending.length > 0; round++) {
+        const reference = await computeReferenceOrbit(
+            originReal + (2n * scaleFixed * BigInt(refX)) / BigInt(width),
+            originImag + (2n * scaleFixed * BigInt(refY)) / BigInt(height),
+            c, power, maxIterations, bits, deadline
+        );
+        if (!reference) {
+            return null;
+        }
+
+        const glitched = [];
+        for (let p = 0; p < pending.length; p++) {
+            if (p % pixelBatch === pixelBatch - 1 && await pastDeadline(deadline)) {
+                return null;
+            }
+
+            const idx = pending[p];
+            const x = idx % width;
+            const y = (idx - x) / width;
+
+            const mu = iteratePerturbed((x - refX) * stepReal, (y - refY) * stepImag, reference, power, maxIterations);
+            if (mu === null) {
+                glitched.push(idx);
+                continue;
+            }
+            smooth[idx] = mu;
+        }
+
+        pending = glitched;
+        if (pending.length > 0) {
+            // Re-reference from the middle of the glitched set
+            const next = pending[Math.floor(pending.length / 2)];
+            refX = next % width;
+            refY = (next - refX) / width;
+        }
+    }
+
+    if (pending.length > 0) {
+        console.log(`Deep zoom: ${pending.length} pixels still glitched after ${MAX_REFERENCES} references, iterating them directly.`);
+        const cReal = numberToFixed(c.real, bits);
+        const cImag = numberToFixed(c.imag, bits);
+        for (let p = 0; p < pending.length; p++) {
+            const idx = pending[p];
+            const x = idx % width;
+            const y = (idx - x) / width;
+            const mu = await iterateFixed(
+                originReal + (2n * scaleFixed * BigInt(x)) / BigInt(width),
+                originImag + (2n * scaleFixed * BigInt(y)) / BigInt(height),
+                cReal, cImag, power, maxIterations, bits, deadline
+            );
+            if (mu === null) {
+                return null;
+            }
+            smooth[idx] = mu;
+        }
+    }
+
+    const canvas = createCanvas(width, height);
+    const ctx = canvas.getContext('2d');
+    const imageData = ctx.createImageData(width, height);
+    const data = imageData.data;
+    for (let i = 0; i < width * height; i++) {
+        const colour = getColour(smooth[i], maxIterations, colourScheme);
+        data[i * 4] = colour[0];
+        data[i * 4 + 1] = colour[1];
+        data[i * 4 + 2] = colour[2];
+        data[i * 4 + 3] = colour[3];
+    }
+    ctx.putImageData(imageData, 0, 0);
+    return canvas.toBuffer('image/png');
+}
+
+module.exports = { generateDeepFractal, deepOptionsError };
@@ -56,6 +56,26 @@ function iterate(z, c, power) {
     };
 }
 
+// Smooth (fractional) iteration count for a point that escaped to z after n iterations
+function smoothIteration(n, zReal, zImag, power, maxIterations) {
+    if (n >= maxIterations) return n;
+    return n + 1 - Math.log(Math.log(Math.sqrt(zReal * zReal + zImag * zImag))) / Math.log(power);
+}
+
+// Escape-time kernel for one point of the plane, returning the smooth iteration count
+function escapeTime(real, imag, c, power, maxIterations) {
+    let z = { real, imag };
+
+    let n = 0;
+    while (n < maxIterations) {
+        z = iterate(z, c, power);
+        if ((z.real * z.real + z.imag * z.imag) > 4) break;
+        n++;
+    }
+
+    return smoothIteration(n, z.real, z.imag, power, maxIterations);
+}
+
 async function generateFractal({
     width = 800,
     height = 600,
@@ -83,22 +103,11 @@ async function generateFractal({
                 return null;
             }
 
-            let z = {
-                real: map(x, 0, width, -scale + offsetX, scale + offsetX),
-                imag: map(y, 0, height, -scale + offsetY, scale + offsetY)
-            };
-
-            let n = 0;
-            while (n < maxIterations) {
-                z = iterate(z, c, power);
-                if ((z.real * z.real + z.imag * z.imag) > 4) break;
-                n++;
-            }
-
-            let mu = n;
-            if (n < maxIterations) {
-                mu = n + 1 - Math.log(Math.log(Math.sqrt(z.real * z.real + z.imag * z.imag))) / Math.log(power);
-            }
+            const mu = escapeTime(
+                map(x, 0, width, -scale + offsetX, scale + offsetX),
+                map(y, 0, height, -scale + offsetY, scale + offsetY),
+                c, power, maxIterations
+            );
 
             const colour = getColour(mu, maxIterations, colourScheme);
             const idx = (y * width + x) * 4;
@@ -115,4 +124,4 @@ async function generateFractal({
     return canvas.toBuffer('image/png');
 }
 
-module.exports = { generateFractal };
\ No newline at end of file
+module.exports = { generateFractal, getColour, escapeTime, smoothIteration };
\ No newline at end of file
@@ -1,6 +1,12 @@
 const db = require('../database.js');
 const cacheService = require('../services/cacheService');
 
+// REAL columns underflow below ~1e-38, so deep zooms keep their exact view in deep_zoom
+const toReal = (value) => {
+    const number = Number(value);
+    return Math.abs(number) < 1e-37 ? 0 : number;
+};
+
 exports.findFractalByHash = async (hash) => {
     const cacheKey = `fractal:hash:${hash}`;
     let cachedFractal = await cacheService.get(cacheKey);
@@ -19,7 +25,7 @@ exports.findFractalByHash = async (hash) => {
 
     // If not in cache, or cache was stale, query the database
     return new Promise((resolve, reject) => {
-        const sql = "SELECT id, hash, width, height, iterations, power, c_real, c_imag, scale, \"offsetX\", \"offsetY\", \"colourScheme\", s3_key FROM fractals WHERE hash = $1";
+        const sql = "SELECT id, hash, width, height, iterations, power, c_real, c_imag, scale, \"offsetX\", \"offsetY\", \"colourScheme\", deep_zoom, s3_key FROM fractals WHERE hash = $1";
         db.query(sql, [hash], (err, result) => {
             if (err) return reject(err);
             const fractal = result.rows[0];
@@ -33,9 +39,10 @@ exports.findFractalByHash = async (hash) => {
 
 exports.createFractal = (data) => {
     return new Promise((resolve, reject) => {
-        const sql = `INSERT INTO fractals (hash, width, height, iterations, power, c_real, c_imag, scale, "offsetX", "offsetY", "colourScheme", s3_key) 
-                     VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12) RETURNING id`;
-        const params = [data.hash, data.width, data.height, data.maxIterations, data.power, data.c.real, data.c.imag, data.scale, data.offsetX, data.offsetY, data.colourScheme, data.s3Key];
+        const sql = `INSERT INTO fractals (hash, width, height, iterations, power, c_real, c_imag, scale, "offsetX", "offsetY", "colourScheme", deep_zoom, s3_key) 
+                     VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13) RETURNING id`;
+        const deepZoom = data.deepZoom ? JSON.stringify({ scale: data.scale, offsetX: data.offsetX, offsetY: data.offsetY }) : null;
+        const params = [data.hash, data.width, data.height, data.maxIterations, data.power, data.c.real, data.c.imag, toReal(data.scale), toReal(data.offsetX), toReal(data.offsetY), data.colourScheme, deepZoom, data.s3Key];
         db.query(sql, params, (err, result) => {
             if (err) return reject(err);
             const newFractalId = result.rows[0].id;
@@ -78,7 +85,7 @@ exports.deleteFractal = async (id) => {
 
 exports.getFractalById = (id) => {
     return new Promise((resolve, reject) => {
-        const sql = "SELECT id, hash, width, height, iterations, power, c_real, c_imag, scale, \"offsetX\", \"offsetY\", \"colourScheme\", s3_key FROM fractals WHERE id = $1";
+        const sql = "SELECT id, hash, width, height, iterations, power, c_real, c_imag, scale, \"offsetX\", \"offsetY\", \"colourScheme\", deep_zoom, s3_key FROM fractals WHERE id = $1";
         db.query(sql, [id], (err, result) => {
             if (err) return reject(err);
             resolve(result.rows[0]);
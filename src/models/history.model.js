@@ -3,7 +3,7 @@ const db = require('../database.js');
 exports.getHistoryForUser = (userId) => {
     return new Promise((resolve, reject) => {
         const sql = `
-        SELECT h.id, h.username, f.hash, f.width, f.height, f.iterations, f.power, f.c_real, f.c_imag, f.scale, f."offsetX", f."offsetY", f."colourScheme", h.generated_at, (f.id IS NULL) AS fractal_deleted
+        SELECT h.id, h.username, f.hash, f.width, f.height, f.iterations, f.power, f.c_real, f.c_imag, f.scale, f."offsetX", f."offsetY", f."colourScheme", f.deep_zoom, h.generated_at, (f.id IS NULL) AS fractal_deleted
         FROM history h
         LEFT JOIN fractals f ON h.fractal_id = f.id
         WHERE h.user_id = $1
@@ -90,7 +90,7 @@ exports.getAllHistory = (filters, sortBy, sortOrder, limit, offset) => {
             const totalCount = parseInt(countResult.rows[0].totalCount);
 
             const dataSql = `
-                SELECT h.id, h.user_id, h.username, f.hash, f.width, f.height, f.iterations, f.power, f.c_real, f.c_imag, f.scale, f."offsetX", f."offsetY", f."colourScheme", h.generated_at, f.s3_key, (f.id IS NULL) AS fractal_deleted
+                SELECT h.id, h.user_id, h.username, f.hash, f.width, f.height, f.iterations, f.power, f.c_real, f.c_imag, f.scale, f."offsetX", f."offsetY", f."colourScheme", f.deep_zoom, h.generated_at, f.s3_key, (f.id IS NULL) AS fractal_deleted
                 FROM history h
                 LEFT JOIN fractals f ON h.fractal_id = f.id
                 ${whereSql}
@@ -18,8 +18,6 @@ async function initialiseCognitoConfig() {
     }
 }
 
-initialiseCognitoConfig();
-
 async function secretHash(clientId, username) {
     const POOL_REGION = await awsConfigService.getParameter('/n11051337/aws_region');
     if (!POOL_REGION) {
@@ -45,7 +43,7 @@ async function initialiseIdVerifier() {
     });
 }
 
-initialiseIdVerifier();
+const initialised = initialiseIdVerifier();
 
 async function verifyToken(req, res, next) {
     const authHeader = req.headers['authorization'];
@@ -219,4 +217,5 @@ router.post('/confirm-mfa', async (req, res) => {
 });
 
 exports.router = router;
-exports.verifyToken = verifyToken;
\ No newline at end of file
+exports.verifyToken = verifyToken;
+exports.initialised = initialised;
\ No newline at end of file
@@ -1,6 +1,8 @@
 const express = require('express');
 const router = express.Router();
 const { generateFractal } = require('../fractal');
+const { generateDeepFractal, deepOptionsError } = require('../deepZoom');
+const { renderSequence, assembleApng } = require('../sequence');
 const crypto = require('crypto');
 const { verifyToken } = require('./auth.js');
 const Fractal = require('../models/fractal.model.js');
@@ -18,12 +20,25 @@ const generateCacheKey = (userId, filters, sortBy, sortOrder, limit, offset) =>
 };
 
 let isGenerating = false;
+// Sequences hold a pool of worker threads, so only one runs at a time
+let isGeneratingSequence = false;
+
+const MAX_SEQUENCE_FRAMES = 600;
+const MAX_SEQUENCE_KEYFRAMES = 50;
+const MAX_SEQUENCE_PIXELS = 1920 * 1080;
+const MAX_SEQUENCE_ITERATIONS = 5000;
+const SEQUENCE_MAX_TIME = 120000;
+// An apng is assembled from every frame held in memory at once, so it gets tighter limits
+const MAX_APNG_FRAMES = 120;
+const MAX_APNG_PIXELS = 1280 * 720;
 
 router.get('/fractal', verifyToken, async (req, res) => {
     if (isGenerating) {
         return res.status(429).send('Another fractal is currently generating. Try again later.');
     }
 
+    const deepZoom = req.query.deep === 'true' || req.query.deep === '1';
+
     const options = {
         width: parseInt(req.query.width) || 1920,
         height: parseInt(req.query.height) || 1080,
@@ -39,6 +54,21 @@ router.get('/fractal', verifyToken, async (req, res) => {
         colourScheme: req.query.color || 'rainbow',
     };
 
+    if (deepZoom) {
+        // Deep zoom keeps the view as decimal strings so no precision is lost before rendering
+        const scale = req.query.scale || '1';
+        const offsetX = req.query.offsetX || '0';
+        const offsetY = req.query.offsetY || '0';
+        const optionsError = deepOptionsError({ ...options, scale, offsetX, offsetY });
+        if (optionsError) {
+            return res.status(400).send(optionsError);
+        }
+        options.scale = scale.trim();
+        options.offsetX = offsetX.trim();
+        options.offsetY = offsetY.trim();
+        options.deepZoom = true;
+    }
+
     const hash = crypto.createHash('sha256').update(JSON.stringify(options)).digest('hex');
 
     try {
@@ -82,7 +112,7 @@ router.get('/fractal', verifyToken, async (req, res) => {
 
             let buffer;
             try {
-                buffer = await generateFractal(options);
+                buffer = deepZoom ? await generateDeepFractal(options) : await generateFractal(options);
             } catch (err) {
 
                 return res.status(500).send('Fractal generation failed');
@@ -129,4 +159,129 @@ router.get('/fractal', verifyToken, async (req, res) => {
     }
 });
 
+router.post('/fractal/sequence', verifyToken, async (req, res) => {
+    const body = req.body || {};
+    const width = parseInt(body.width) || 640;
+    const height = parseInt(body.height) || 360;
+    const frameCount = parseInt(body.frames) || 0;
+    const format = body.format || 'frames';
+    const fps = Math.min(Math.max(parseInt(body.fps) || 12, 1), 60);
+
+    if (!Array.isArray(body.keyframes) || body.keyframes.length === 0 || body.keyframes.length > MAX_SEQUENCE_KEYFRAMES) {
+        return res.status(400).send(`keyframes must be an array of 1 to ${MAX_SEQUENCE_KEYFRAMES} entries.`);
+    }
+    if (frameCount < 1 || frameCount > MAX_SEQUENCE_FRAMES) {
+        return res.status(400).send(`frames must be between 1 and ${MAX_SEQUENCE_FRAMES}.`);
+    }
+    if (width < 1 || height < 1 || width * height > MAX_SEQUENCE_PIXELS) {
+        return res.status(400).send(`Frames may be at most ${MAX_SEQUENCE_PIXELS} pixels.`);
+    }
+    if (format !== 'frames' && format !== 'apng') {
+        return res.status(400).send("format must be 'frames' or 'apng'.");
+    }
+    if (format === 'apng' && (frameCount > MAX_APNG_FRAMES || width * height > MAX_APNG_PIXELS)) {
+        return res.status(400).send(`apng sequences may have at most ${MAX_APNG_FRAMES} frames of ${MAX_APNG_PIXELS} pixels.`);
+    }
+    const maxIterations = parseInt(body.iterations) || 500;
+    if (maxIterations < 1 || maxIterations > MAX_SEQUENCE_ITERATIONS) {
+        return res.status(400).send(`iterations must be between 1 and ${MAX_SEQUENCE_ITERATIONS}.`);
+    }
+
+    const keyframes = body.keyframes.map(keyframe => ({
+        scale: parseFloat(keyframe.scale) || 1,
+        offsetX: parseFloat(keyframe.offsetX) || 0,
+        offsetY: parseFloat(keyframe.offsetY) || 0,
+        power: parseFloat(keyframe.power) || 2,
+        c: {
+            real: parseFloat(keyframe.real) || 0.285,
+            imag: parseFloat(keyframe.imag) || 0.01
+        }
+    }));
+    if (keyframes.some(keyframe => !Number.isFinite(keyframe.scale) || keyframe.scale <= 0)) {
+        return res.status(400).send('Keyframe scale must be positive.');
+    }
+
+    if (isGeneratingSequence) {
+        return res.status(429).send('Another sequence is currently generating. Try again later.');
+    }
+    isGeneratingSequence = true;
+
+    const options = {
+        keyframes,
+        frameCount,
+        width,
+        height,
+        maxIterations,
+        colourScheme: body.color || 'rainbow',
+    };
+    const hash = crypto.createHash('sha256').update(JSON.stringify(options)).digest('hex');
+
+    // Progress is streamed as one JSON object per line while frames render
+    res.setHeader('Content-Type', 'application/x-ndjson');
+    res.flushHeaders();
+    const send = (event) => res.write(JSON.stringify(event) + '\n');
+
+    // Stop the workers if the client goes away mid-sequence
+    const cancel = new AbortController();
+    res.on('close', () => {
+        if (!res.writableFinished) cancel.abort();
+    });
+
+    const frameKeys = [];
+    const pngs = [];
+    // A sequence that doesn't finish leaves no frames behind in S3. Uploads still in
+    // flight when it is abandoned delete their own frame once they land.
+    let abandoned = false;
+    const removeFrames = () => {
+        abandoned = true;
+        return Promise.allSettled(frameKeys.filter(Boolean).map(key => s3Service.deleteFile(key)));
+    };
+
+    try {
+        const summary = await renderSequence({
+            ...options,
+            maxTime: SEQUENCE_MAX_TIME,
+            signal: cancel.signal,
+            onFrame: async ({ index, png, completed, total, fps: framesPerSecond, reusedFraction }) => {
+                if (format === 'apng') {
+                    pngs[index] = png;
+                } else {
+                    const frameName = `frame_${String(index).padStart(4, '0')}`;
+                    const key = await s3Service.uploadFile(png, 'image/png', `sequences/${hash}`, frameName);
+                    if (abandoned) {
+                        return s3Service.deleteFile(key);
+                    }
+                    frameKeys[index] = key;
+                }
+                send({ event: 'frame', index, completed, total, fps: framesPerSecond, reusedFraction });
+            }
+        });
+
+        if (!summary) {
+            await removeFrames();
+            send({ event: 'error', message: 'Sequence generation aborted due to time limit.' });
+            return res.end();
+        }
+
+        const result = { event: 'done', hash, ...summary };
+        if (format === 'apng') {
+            const animation = assembleApng(pngs, fps);
+            const key = await s3Service.uploadFile(animation, 'image/apng', 'sequences', hash);
+            result.url = await s3Service.getPresignedUrl(key);
+        } else {
+            result.urls = await Promise.all(frameKeys.map(key => s3Service.getPresignedUrl(key)));
+        }
+        send(result);
+    } catch (error) {
+        if (!cancel.signal.aborted) {
+            console.error("Error in /fractal/sequence route:", error);
+            send({ event: 'error', message: 'Sequence generation failed' });
+        }
+        await removeFrames();
+    } finally {
+        isGeneratingSequence = false;
+    }
+    res.end();
+});
+
 module.exports = router;
\ No newline at end of file
@@ -0,0 +1,238 @@
+const os = require('os');
+const path = require('path');
+const { Worker } = require('worker_threads');
+
+const MAX_WORKERS = 8;
+
+function lerp(a, b, t) {
+    return a + (b - a) * t;
+}
+
+// Spreads frameCount frames evenly across the keyframes. Scale is interpolated
+// geometrically so a zoom moves at a constant rate; everything else is linear. Pans at
+// a fixed scale are snapped to whole pixels so neighbouring frames share a pixel grid.
+function planFrames(keyframes, frameCount, width, height) {
+    const frames = [];
+    for (let i = 0; i < frameCount; i++) {
+        const position = frameCount > 1 ? (i / (frameCount - 1)) * (keyframes.length - 1) : 0;
+        const segment = Math.min(Math.floor(position), Math.max(keyframes.length - 2, 0));
+        const from = keyframes[segment];
+        const to = keyframes[Math.min(segment + 1, keyframes.length - 1)];
+        const t = position - segment;
+
+        let offsetX = lerp(from.offsetX, to.offsetX, t);
+        let offsetY = lerp(from.offsetY, to.offsetY, t);
+        if (from.scale === to.scale) {
+            const stepX = 2 * from.scale / width;
+            const stepY = 2 * from.scale / height;
+            offsetX = from.offsetX + Math.round((offsetX - from.offsetX) / stepX) * stepX;
+            offsetY = from.offsetY + Math.round((offsetY - from.offsetY) / stepY) * stepY;
+        }
+
+        frames.push({
+            scale: Math.exp(lerp(Math.log(from.scale), Math.log(to.scale), t)),
+            offsetX,
+            offsetY,
+            power: lerp(from.power, to.power, t),
+            c: {
+                real: lerp(from.c.real, to.c.real, t),
+                imag: lerp(from.c.imag, to.c.imag, t)
+            }
+        });
+    }
+    return frames;
+}
+
+// Renders the frames on a pool of worker threads. Each worker takes a contiguous run
+// of frames so it can reuse its previous frame; onFrame is called as each one finishes.
+// Resolves to null if maxTime runs out. Rejects if a worker or onFrame fails, or if
+// signal aborts. In every case the remaining workers are terminated.
+function renderSequence({
+    keyframes,
+    frameCount,
+    width = 640,
+    height = 360,
+    maxIterations = 500,
+    colourScheme = "rainbow",
+    maxTime = 120000,
+    signal = null,
+    onFrame = () => {}
+}) {
+    const frames = planFrames(keyframes, frameCount, width, height);
+    const workerCount = Math.max(1, Math.min(frames.length, os.cpus().length, MAX_WORKERS));
+    const chunkSize = Math.ceil(frames.length / workerCount);
+
+    return new Promise((resolve, reject) => {
+        const startTime = Date.now();
+        const workers = [];
+        let completed = 0;
+        let reusedPixels = 0;
+        let running = 0;
+        let settled = false;
+        // Frame callbacks run one after another so a failure stops the chain
+        let callbacks = Promise.resolve();
+
+        const finish = (error, result) => {
+            if (settled) return;
+            settled = true;
+            clearTimeout(deadline);
+            if (signal) signal.removeEventListener('abort', onAbort);
+            workers.forEach(worker => worker.terminate());
+            if (error) {
+                reject(error);
+            } else {
+                resolve(result);
+            }
+        };
+
+        const onAbort = () => finish(new Error('Sequence generation cancelled.'));
+        const deadline = setTimeout(() => finish(null, null), maxTime);
+        if (signal) {
+            if (signal.aborted) return onAbort();
+            signal.addEventListener('abort', onAbort);
+        }
+
+        const workerDone = () => {
+            running--;
+            if (running > 0) return;
+            callbacks.then(() => {
+                const elapsed = (Date.now() - startTime) / 1000;
+                finish(null, {
+                    frames: frames.length,
+                    workers: workers.length,
+                    seconds: elapsed,
+                    fps: elapsed > 0 ? frames.length / elapsed : 0,
+                    reusedFraction: reusedPixels / (frames.length * width * height)
+                });
+            });
+        };
+
+        for (let start = 0; start < frames.length; start += chunkSize) {
+            const worker = new Worker(path.join(__dirname, 'sequenceWorker.js'), {
+                workerData: {
+                    frames: frames.slice(start, start + chunkSize),
+                    startIndex: start,
+                    width,
+                    height,
+                    maxIterations,
+                    colourScheme
+                }
+            });
+            workers.push(worker);
+            running++;
+
+            worker.on('message', ({ index, png, reused }) => {
+                completed++;
+                reusedPixels += reused;
+                const elapsed = (Date.now() - startTime) / 1000;
+                const frame = {
+                    index,
+                    png: Buffer.from(png.buffer, png.byteOffset, png.byteLength),
+                    completed,
+                    total: frames.length,
+                    fps: elapsed > 0 ? completed / elapsed : 0,
+                    reusedFraction: reused / (width * height)
+                };
+                callbacks = callbacks
+                    .then(() => settled ? undefined : onFrame(frame))
+                    .catch(error => finish(error));
+            });
+            worker.on('error', error => finish(error));
+            worker.on('exit', (code) => {
+                if (settled) return;
+                if (code !== 0) {
+                    finish(new Error(`Sequence worker stopped with exit code ${code}`));
+                } else {
+                    workerDone();
+                }
+            });
+        }
+    });
+}
+
+const CRC_TABLE = (() => {
+    const table = new Int32Array(256);
+    for (let n = 0; n < 256; n++) {
+        let c = n;
+        for (let k = 0; k < 8; k++) {
+            c = (c & 1) ? (0xedb88320 ^ (c >>> 1)) : (c >>> 1);
+        }
+        table[n] = c;
+    }
+    return table;
+})();
+
+function crc32(buffer) {
+    let crc = -1;
+    for (let i = 0; i < buffer.length; i++) {
+        crc = CRC_TABLE[(crc ^ buffer[i]) & 0xff] ^ (crc >>> 8);
+    }
+    return (crc ^ -1) >>> 0;
+}
+
+function pngChunk(type, data) {
+    const chunk = Buffer.alloc(12 + data.length);
+    chunk.writeUInt32BE(data.length, 0);
+    chunk.write(type, 4, 'ascii');
+    data.copy(chunk, 8);
+    chunk.writeUInt32BE(crc32(chunk.subarray(4, 8 + data.length)), 8 + data.length);
+    return chunk;
+}
+
+function readPngChunks(png) {
+    const chunks = [];
+    let offset = 8;
+    while (offset < png.length) {
+        const length = png.readUInt32BE(offset);
+        const type = png.toString('ascii', offset + 4, offset + 8);
+        chunks.push({ type, data: png.subarray(offset + 8, offset + 8 + length) });
+        offset += 12 + length;
+    }
+    return chunks;
+}
+
+// Stitches same-sized PNG frames into an animated PNG without re-encoding them
+function assembleApng(pngs, fps = 12) {
+    const signature = pngs[0].subarray(0, 8);
+    const header = readPngChunks(pngs[0]).find(chunk => chunk.type === 'IHDR').data;
+    const width = header.readUInt32BE(0);
+    const height = header.readUInt32BE(4);
+
+    const actl = Buffer.alloc(8);
+    actl.writeUInt32BE(pngs.length, 0);
+    actl.writeUInt32BE(0, 4); // loop forever
+
+    const parts = [signature, pngChunk('IHDR', header), pngChunk('acTL', actl)];
+    let sequence = 0;
+
+    pngs.forEach((png, frameIndex) => {
+        const fctl = Buffer.alloc(26);
+        fctl.writeUInt32BE(sequence++, 0);
+        fctl.writeUInt32BE(width, 4);
+        fctl.writeUInt32BE(height, 8);
+        fctl.writeUInt32BE(0, 12);
+        fctl.writeUInt32BE(0, 16);
+        fctl.writeUInt16BE(1, 20);
+        fctl.writeUInt16BE(fps, 22);
+        fctl.writeUInt8(0, 24); // dispose: none
+        fctl.writeUInt8(0, 25); // blend: source
+        parts.push(pngChunk('fcTL', fctl));
+
+        for (const chunk of readPngChunks(png)) {
+            if (chunk.type !== 'IDAT') continue;
+            if (frameIndex === 0) {
+                parts.push(pngChunk('IDAT', chunk.data));
+            } else {
+                const fdat = Buffer.alloc(4 + chunk.data.length);
+                fdat.writeUInt32BE(sequence++, 0);
+                chunk.data.copy(fdat, 4);
+                parts.push(pngChunk('fdAT', fdat));
+            }
+        }
+    });
+
+    parts.push(pngChunk('IEND', Buffer.alloc(0)));
+    return Buffer.concat(parts);
+}
+
+module.exports = { planFrames, renderSequence, assembleApng };
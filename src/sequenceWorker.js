@@ -0,0 +1,150 @@
+const { parentPort, workerData } = require('worker_threads');
+const { createCanvas } = require('canvas');
+const { getColour, escapeTime } = require('./fractal');
+
+// Renders a contiguous run of sequence frames. Neighbouring frames share a palette
+// table and reuse each other's pixels: a pixel landing exactly on the previous frame's
+// grid (whole-pixel pans) is copied, and one falling between four exactly computed
+// neighbours that agree closely (or are all interior) is interpolated from them.
+// Interpolated pixels are never used as a source, so errors do not build up over frames.
+
+const PALETTE_SIZE = 4096;
+const GRID_TOLERANCE = 1e-6; // in units of the previous frame's pixel step
+const INTERPOLATION_TOLERANCE = 0.05; // max spread of the four neighbours, in iterations
+
+function buildPalette(maxIterations, colourScheme) {
+    const palette = new Uint8ClampedArray((PALETTE_SIZE + 1) * 4);
+    for (let i = 0; i < PALETTE_SIZE; i++) {
+        const t = i / (PALETTE_SIZE - 1);
+        // getColour takes an iteration count and uses sqrt(n / max) internally
+        const colour = getColour(t * t * maxIterations * (1 - 1e-12), maxIterations, colourScheme);
+        palette.set(colour, i * 4);
+    }
+    palette.set(getColour(maxIterations, maxIterations, colourScheme), PALETTE_SIZE * 4);
+    return palette;
+}
+
+function coordinate(i, size, scale, offset) {
+    return -scale + offset + 2 * scale * (i / size);
+}
+
+// For each pixel column (or row) of the new frame, its fractional position in the
+// previous frame, or -1 if it falls outside it.
+function sourcePositions(size, scale, offset, prevScale, prevOffset) {
+    const positions = new Float64Array(size);
+    const prevStart = -prevScale + prevOffset;
+    const prevStep = 2 * prevScale / size;
+    for (let i = 0; i < size; i++) {
+        const position = (coordinate(i, size, scale, offset) - prevStart) / prevStep;
+        const nearest = Math.round(position);
+        if (Math.abs(position - nearest) < GRID_TOLERANCE) {
+            positions[i] = nearest >= 0 && nearest < size ? nearest : -1;
+        } else {
+            positions[i] = position >= 0 && position < size - 1 ? position : -1;
+        }
+    }
+    return positions;
+}
+
+function canReuse(prev, frame) {
+    return prev && prev.power === frame.power && prev.c.real === frame.c.real && prev.c.imag === frame.c.imag;
+}
+
+// Value for one pixel taken from the previous frame, or -1 if it has to be computed
+function reusePixel(prev, fx, fy, width, maxIterations) {
+    if (Number.isInteger(fx) && Number.isInteger(fy)) {
+        const idx = fy * width + fx;
+        return prev.exact[idx] ? prev.smooth[idx] : -1;
+    }
+
+    const x0 = Math.floor(fx);
+    const y0 = Math.floor(fy);
+    const x1 = Number.isInteger(fx) ? x0 : x0 + 1;
+    const y1 = Number.isInteger(fy) ? y0 : y0 + 1;
+    const corners = [y0 * width + x0, y0 * width + x1, y1 * width + x0, y1 * width + x1];
+    if (!corners.every(idx => prev.exact[idx])) return -1;
+
+    const [a, b, c, d] = corners.map(idx => prev.smooth[idx]);
+    const lowest = Math.min(a, b, c, d);
+    const highest = Math.max(a, b, c, d);
+    if (lowest >= maxIterations) return maxIterations;
+    if (highest >= maxIterations || highest - lowest > INTERPOLATION_TOLERANCE) return -1;
+
+    const tx = fx - x0;
+    const ty = fy - y0;
+    return (a * (1 - tx) + b * tx) * (1 - ty) + (c * (1 - tx) + d * tx) * ty;
+}
+
+function renderFrame(frame, prev, width, height, maxIterations) {
+    const { power, c, scale, offsetX, offsetY } = frame;
+    const smooth = new Float64Array(width * height);
+    const exact = new Uint8Array(width * height);
+    let reused = 0;
+
+    let columns = null;
+    let rows = null;
+    if (canReuse(prev, frame)) {
+        columns = sourcePositions(width, scale, offsetX, prev.scale, prev.offsetX);
+        rows = sourcePositions(height, scale, offsetY, prev.scale, prev.offsetY);
+    }
+
+    for (let x = 0; x < width; x++) {
+        for (let y = 0; y < height; y++) {
+            const idx = y * width + x;
+
+            if (columns && columns[x] >= 0 && rows[y] >= 0) {
+                const value = reusePixel(prev, columns[x], rows[y], width, maxIterations);
+                if (value >= 0) {
+                    smooth[idx] = value;
+                    // Whole-pixel copies are as good as computed ones
+                    exact[idx] = Number.isInteger(columns[x]) && Number.isInteger(rows[y]) ? 1 : 0;
+                    reused++;
+                    continue;
+                }
+            }
+
+            smooth[idx] = escapeTime(
+                coordinate(x, width, scale, offsetX),
+                coordinate(y, height, scale, offsetY),
+                c, power, maxIterations
+            );
+            exact[idx] = 1;
+        }
+    }
+
+    return { smooth, exact, reused };
+}
+
+function encodeFrame(smooth, palette, width, height, maxIterations) {
+    const canvas = createCanvas(width, height);
+    const ctx = canvas.getContext('2d');
+    const imageData = ctx.createImageData(width, height);
+    const data = imageData.data;
+
+    for (let i = 0; i < smooth.length; i++) {
+        const mu = smooth[i];
+        let entry = PALETTE_SIZE;
+        if (mu < maxIterations) {
+            const t = Math.sqrt(Math.max(mu, 0) / maxIterations);
+            entry = Math.min(PALETTE_SIZE - 1, Math.round(t * (PALETTE_SIZE - 1)));
+        }
+        data[i * 4] = palette[entry * 4];
+        data[i * 4 + 1] = palette[entry * 4 + 1];
+        data[i * 4 + 2] = palette[entry * 4 + 2];
+        data[i * 4 + 3] = palette[entry * 4 + 3];
+    }
+
+    ctx.putImageData(imageData, 0, 0);
+    return canvas.toBuffer('image/png');
+}
+
+const { frames, startIndex, width, height, maxIterations, colourScheme } = workerData;
+const palette = buildPalette(maxIterations, colourScheme);
+
+let prev = null;
+frames.forEach((frame, i) => {
+    const { smooth, exact, reused } = renderFrame(frame, prev, width, height, maxIterations);
+    const png = encodeFrame(smooth, palette, width, height, maxIterations);
+    prev = { ...frame, smooth, exact };
+    parentPort.postMessage({ index: startIndex + i, png, reused });
+});
@@ -1,16 +1,106 @@
 const { SecretsManagerClient, GetSecretValueCommand } = require("@aws-sdk/client-secrets-manager");
-const { SSMClient, GetParameterCommand } = require("@aws-sdk/client-ssm");
+const { SSMClient, GetParameterCommand, GetParametersCommand } = require("@aws-sdk/client-ssm");
+const fs = require('fs');
+const path = require('path');
+
+const BOOTSTRAP_REGION = "ap-southeast-2";
+
+// Every parameter the app reads on boot, fetched in one GetParameters call (max 10 names)
+const APP_PARAMETERS = [
+    '/n11051337/aws_region',
+    '/n11051337/port',
+    '/n11051337/s3_bucket_name',
+    '/n11051337/s3_tag_qut_username',
+    '/n11051337/s3_tag_purpose',
+    '/n11051337/memcached_address',
+    '/n11051337/user_pool_id',
+    '/n11051337/client_id',
+];
+
+const CONFIG_SNAPSHOT_PATH = process.env.CONFIG_SNAPSHOT_PATH || path.join(__dirname, '..', '..', '.config-snapshot.json');
 
 let cachedAwsRegion = null;
 let jwtSecret = null;
 let cognitoClientSecret = null;
 
+let parameterCache = {};
+let configLoaded = null;
+let configSource = null;
+
+function readConfigSnapshot() {
+    try {
+        const snapshot = JSON.parse(fs.readFileSync(CONFIG_SNAPSHOT_PATH, 'utf8'));
+        return snapshot.parameters || null;
+    } catch (error) {
+        return null;
+    }
+}
+
+function writeConfigSnapshot(parameters) {
+    try {
+        fs.writeFileSync(CONFIG_SNAPSHOT_PATH, JSON.stringify({ savedAt: new Date().toISOString(), parameters }, null, 2));
+    } catch (error) {
+        console.error(`Error writing config snapshot to ${CONFIG_SNAPSHOT_PATH}:`, error.message);
+    }
+}
+
+async function fetchAppParameters() {
+    try {
+        const client = new SSMClient({ region: BOOTSTRAP_REGION });
+        const response = await client.send(new GetParametersCommand({
+            Names: APP_PARAMETERS,
+            WithDecryption: true,
+        }));
+        const parameters = {};
+        for (const parameter of response.Parameters || []) {
+            parameters[parameter.Name] = parameter.Value;
+        }
+        if (response.InvalidParameters && response.InvalidParameters.length > 0) {
+            console.error('Parameters missing from Parameter Store:', response.InvalidParameters.join(', '));
+        }
+        // Only a complete set is worth falling back to later
+        if (APP_PARAMETERS.every(name => name in parameters)) {
+            writeConfigSnapshot(parameters);
+        } else {
+            console.error(`Parameter Store returned an incomplete set, leaving config snapshot ${CONFIG_SNAPSHOT_PATH} unchanged.`);
+        }
+        configSource = 'ssm';
+        return parameters;
+    } catch (error) {
+        const snapshot = readConfigSnapshot();
+        if (!snapshot) {
+            console.error('Error fetching parameters from Parameter Store and no config snapshot is available:', error);
+            process.exit(1);
+        }
+        console.error(`Error fetching parameters from Parameter Store, using config snapshot ${CONFIG_SNAPSHOT_PATH}:`, error.message);
+        configSource = 'snapshot';
+        return snapshot;
+    }
+}
+
+function loadConfig() {
+    if (!configLoaded) {
+        configLoaded = fetchAppParameters().then((parameters) => {
+            parameterCache = parameters;
+            if (parameters['/n11051337/aws_region']) {
+                cachedAwsRegion = parameters['/n11051337/aws_region'];
+            }
+            return configSource;
+        });
+    }
+    return configLoaded;
+}
+
 async function getAwsRegion() {
+    if (cachedAwsRegion) {
+        return cachedAwsRegion;
+    }
+    await loadConfig();
     if (cachedAwsRegion) {
         return cachedAwsRegion;
     }
     try {
-        const client = new SSMClient({ region: "ap-southeast-2" });
+        const client = new SSMClient({ region: BOOTSTRAP_REGION });
         const command = new GetParameterCommand({
             Name: '/n11051337/aws_region',
             WithDecryption: true,
@@ -30,6 +120,7 @@ async function getAwsRegion() {
 }
 
 module.exports = {
+    loadConfig,
     getAwsRegion,
     getJwtSecret: async () => {
         if (jwtSecret) {
@@ -90,6 +181,11 @@ module.exports = {
         return null;
     },
     getParameter: async (parameterName) => {
+        await loadConfig();
+        if (parameterCache[parameterName]) {
+            return parameterCache[parameterName];
+        }
+
         const region = await getAwsRegion();
         const ssmClient = new SSMClient({ region: region });
 
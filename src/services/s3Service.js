@@ -30,6 +30,7 @@ async function getS3Client() {
   const region = await getAwsRegion();
   s3ClientInstance = new S3Client({
     region: region,
+    forcePathStyle: Boolean(process.env.AWS_ENDPOINT_URL_S3 || process.env.AWS_ENDPOINT_URL),
   });
   return s3ClientInstance;
 }